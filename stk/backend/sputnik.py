@@ -96,7 +96,9 @@ class DSD(torch.autograd.Function):
                 column_indices_t,
                 block_offsets_t,
                 transpose_a,
-                rhs):
+                rhs,
+                offsets_pairs=None,
+                offsets_t_pairs=None):
         ctx.save_for_backward(data,
                               offsets,
                               row_indices,
@@ -123,7 +125,9 @@ class DSD(torch.autograd.Function):
                     block_offsets_t,
                     transpose_a,
                     rhs,
-                    out)
+                    out,
+                    offsets_pairs,
+                    offsets_t_pairs)
         return out
 
     @staticmethod
@@ -144,7 +148,7 @@ class DSD(torch.autograd.Function):
                                   trans_a,
                                   trans_b)
         drhs = None
-        if ctx.needs_input_grad[-1]:
+        if ctx.needs_input_grad[9]:
             op = dds if trans_b else dsd
             drhs = _rhs_gradient(op,
                                  lhs,
@@ -152,7 +156,12 @@ class DSD(torch.autograd.Function):
                                  dy,
                                  trans_a,
                                  trans_b)
-        return None, ddata, None, None, None, None, None, None, None, drhs
+
+        # The packed offsets are optional trailing inputs, so size
+        # the gradient tuple to match the inputs.
+        nones = (None,) * (len(ctx.needs_input_grad) - 10)
+        return (None, ddata, None, None, None, None,
+                None, None, None, drhs) + nones
 
 
 dsd = DSD.apply
@@ -172,7 +181,9 @@ class DDS(torch.autograd.Function):
                 offsets_t,
                 column_indices_t,
                 block_offsets_t,
-                transpose_b):
+                transpose_b,
+                offsets_pairs=None,
+                offsets_t_pairs=None):
         ctx.save_for_backward(lhs,
                               data,
                               offsets,
@@ -196,7 +207,9 @@ class DDS(torch.autograd.Function):
                     column_indices_t,
                     block_offsets_t,
                     transpose_b,
-                    out)
+                    out,
+                    offsets_pairs,
+                    offsets_t_pairs)
         return out
 
     @staticmethod
@@ -225,7 +238,12 @@ class DDS(torch.autograd.Function):
                                   dy,
                                   trans_a,
                                   trans_b)
-        return dlhs, None, ddata, None, None, None, None, None, None, None
+
+        # The packed offsets are optional trailing inputs, so size
+        # the gradient tuple to match the inputs.
+        nones = (None,) * (len(ctx.needs_input_grad) - 10)
+        return (dlhs, None, ddata, None, None, None,
+                None, None, None, None) + nones
 
 
 dds = DDS.apply
@@ -245,7 +263,8 @@ class SDD(torch.autograd.Function):
                 column_indices,
                 offsets_t,
                 column_indices_t,
-                block_offsets_t):
+                block_offsets_t,
+                rowcol=None):
         ctx.save_for_backward(
             lhs,
             rhs,
@@ -266,7 +285,8 @@ class SDD(torch.autograd.Function):
                     out,
                     offsets,
                     row_indices,
-                    column_indices)
+                    column_indices,
+                    rowcol)
         return out
 
     @staticmethod
@@ -296,7 +316,11 @@ class SDD(torch.autograd.Function):
                                  dy,
                                  trans_a,
                                  trans_b)
-        return dlhs, drhs, None, None, None, None, None, None, None, None
+
+        # NOTE: The packed rowcol indices are an optional trailing
+        # input, so size the gradient tuple to match the inputs.
+        nones = (None,) * (len(ctx.needs_input_grad) - 2)
+        return (dlhs, drhs) + nones
 
 
 sdd = SDD.apply
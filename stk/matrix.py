@@ -1,4 +1,5 @@
-import numpy as np
+import math
+
 import torch
 
 # 1. Add heavyweight (data) validation helper.
@@ -23,26 +24,27 @@ def _validate_matrix(shape, data, row_indices, column_indices, offsets):
             f"Got block shape {[data.shape[-2], data.shape[-1]]}")
 
     # Flatten batch dimensions on data - original shape preserved
-    # in shape argument.
+    # in shape argument. Skip the reshape if the data is already
+    # in [nnz, block_size, block_size] form.
     block_size = data.shape[-1]
-    data = data.view([-1, block_size, block_size])
+    if data.dim() != 3:
+        data = data.view([-1, block_size, block_size])
 
     if data.dim() != 3:
         raise ValueError(
             "Expected 3D shape for data (nnz, block, block). "
             f"Got shape {data.dim()}D shape.")
 
-    block_size = data.shape[1]
     if shape[-2] % block_size != 0 or shape[-1] % block_size != 0:
         raise ValueError(
             "Matrix shape must be dividible by blocking. "
             f"Got shape {shape} with "
             f"{[block_size, block_size]} blocking.")
 
-    if np.prod(shape) < data.numel():
+    if math.prod(shape) < data.numel():
         raise ValueError(
             "Invalid matrix. Number of nonzeros exceeds matrix capacity "
-            f"({data.numel()} v. {np.prod(shape)})")
+            f"({data.numel()} v. {math.prod(shape)})")
 
     if row_indices.dim() != 1:
         raise ValueError(
@@ -66,7 +68,7 @@ def _validate_matrix(shape, data, row_indices, column_indices, offsets):
             "Expected 1 index per nonzero block. "
             f"Got {column_indices.numel()} column_indices for {data.shape[0]} blocks")
 
-    block_rows = np.prod(shape[:-1]) / block_size
+    block_rows = math.prod(shape[:-1]) // block_size
     if offsets.numel() != block_rows + 1:
         raise ValueError(
             "Expected one offset per block row plus one. "
@@ -102,6 +104,73 @@ def _validate_matrix(shape, data, row_indices, column_indices, offsets):
     return data
 
 
+##
+### Metadata packing helpers.
+##
+
+
+def _unpack_metadata(buf, nnz, noffsets):
+    row_indices = buf[:nnz]
+    column_indices = buf[nnz:2 * nnz]
+    offsets = buf[2 * nnz:].view(torch.int32)
+    return row_indices, column_indices, offsets
+
+
+def _pack_metadata(row_indices, column_indices, offsets):
+    # Pack the BCSR metadata into one contiguous buffer so that
+    # kernels consuming the indices dereference a single allocation
+    # and device moves touch a single tensor. The int32 offsets
+    # occupy the tail of the int16 buffer.
+    nnz = row_indices.numel()
+    noffsets = offsets.numel()
+    buf = torch.empty(
+        2 * nnz + 2 * noffsets,
+        dtype=torch.int16,
+        device=row_indices.device)
+    views = _unpack_metadata(buf, nnz, noffsets)
+    for view, x in zip(views, (row_indices, column_indices, offsets)):
+        view.copy_(x)
+    return (buf,) + views
+
+
+def _packed_base(row_indices, column_indices, offsets):
+    # Return the shared buffer behind the given metadata views, or
+    # None if they do not sit at exactly the positions produced by
+    # _pack_metadata. Sharing a base is not sufficient - e.g. the
+    # row/column indices could both be sliced from one nonzero()
+    # result - so verify the layout before adopting the base.
+    base = row_indices._base
+    if (base is None or
+        column_indices._base is not base or
+        offsets._base is not base):
+        return None
+    nnz = row_indices.numel()
+    noffsets = offsets.numel()
+    if (base.dtype != torch.int16 or
+        base.numel() != 2 * nnz + 2 * noffsets):
+        return None
+    if not (row_indices.dtype == torch.int16 and
+            row_indices.stride() == (1,) and
+            row_indices.storage_offset() == 0):
+        return None
+    if not (column_indices.dtype == torch.int16 and
+            column_indices.stride() == (1,) and
+            column_indices.storage_offset() == nnz):
+        return None
+    if not (offsets.dtype == torch.int32 and
+            offsets.stride() == (1,) and
+            offsets.storage_offset() == nnz):
+        return None
+    return base
+
+
+def _pack_offsets(offsets):
+    # Pack each block row's boundaries as (start << 32) | end so
+    # kernels can load a single int64 per block row instead of two
+    # int32s.
+    return (offsets[:-1].to(torch.int64) << 32) | offsets[1:].to(torch.int64)
+
+
 def _transpose(size, data, row_indices, column_indices, offsets):
     block_columns = size[1] // data.shape[1]
 
@@ -143,6 +212,19 @@ class Matrix(torch.nn.Module):
         super().__init__()
         self._size = size
         self._data = data
+
+        # Pack the metadata into a single buffer unless the caller
+        # passed views that already share one (e.g. construction
+        # from an existing matrix in `t`, `view` and `clone`).
+        base = _packed_base(row_indices, column_indices, offsets)
+        if base is not None:
+            self._meta_buf = base
+        else:
+            (self._meta_buf,
+             row_indices,
+             column_indices,
+             offsets) = _pack_metadata(
+                 row_indices, column_indices, offsets)
         self._row_indices = row_indices
         self._column_indices = column_indices
         self._offsets = offsets
@@ -152,19 +234,28 @@ class Matrix(torch.nn.Module):
             (block_offsets_t is None)):
             column_indices_t, offsets_t, block_offsets_t = _transpose(
                 size, data, row_indices, column_indices, offsets)
+
+            # Validate that our metadata will not overflow. Skipped
+            # on the hot-path constructors (`t`, `view`, `grad`)
+            # that pass the transpose meta-data in, since the source
+            # matrix was already checked.
+            max_dim = torch.iinfo(torch.int16).max * self.blocking
+            if column_indices.dtype == torch.int16:
+                if size[0] > max_dim or size[1] > max_dim:
+                    raise ValueError(
+                        "Sparse matrix with shape {size} exceeds representable "
+                        "size with 16-bit indices.")
         self._column_indices_t = column_indices_t
         self._offsets_t = offsets_t
         self._block_offsets_t = block_offsets_t
 
         self._transposed = False
 
-        # Validate that our metadata will not overflow.
-        max_dim = np.iinfo(np.int16).max * self.blocking
-        if column_indices.dtype == torch.int16:
-            if size[0] > max_dim or size[1] > max_dim:
-                raise ValueError(
-                    "Sparse matrix with shape {size} exceeds representable "
-                    "size with 16-bit indices.")
+        # Lazily-built packed variants of the metadata (see the
+        # rowcol and offsets_pairs properties). The container is
+        # shared with matrices derived through t(), view() and grad
+        # so each variant is built at most once per topology.
+        self._packed = {}
 
     def validate(self):
         _validate_matrix(self._size,
@@ -180,24 +271,36 @@ class Matrix(torch.nn.Module):
         # need to set the appropriate meta-data type for
         # the given floating-point type.
         self._data = self._data.to(device)
-        self._row_indices = self._row_indices.to(device)
-        self._column_indices = self._column_indices.to(device)
-        self._offsets = self._offsets.to(device)
+        self._meta_buf = self._meta_buf.to(device)
+        (self._row_indices,
+         self._column_indices,
+         self._offsets) = _unpack_metadata(
+             self._meta_buf,
+             self._row_indices.numel(),
+             self._offsets.numel())
         self._column_indices_t = self._column_indices_t.to(device)
         self._offsets_t = self._offsets_t.to(device)
         self._block_offsets_t = self._block_offsets_t.to(device)
+        for key, value in self._packed.items():
+            self._packed[key] = value.to(device)
         return self
 
     def cuda(self):
         return self.to(torch.cuda.current_device())
 
     def clone(self):
+        # Clone the packed buffer once rather than each index
+        # tensor individually.
+        row_indices, column_indices, offsets = _unpack_metadata(
+            self._meta_buf.clone(),
+            self._row_indices.numel(),
+            self._offsets.numel())
         return Matrix(
             self.size(),
             self.data.clone(),
-            self.row_indices.clone(),
-            self.column_indices.clone(),
-            self.offsets.clone(),
+            row_indices,
+            column_indices,
+            offsets,
             self.column_indices_t.clone(),
             self.offsets_t.clone(),
             self.block_offsets_t.clone())
@@ -217,6 +320,7 @@ class Matrix(torch.nn.Module):
                      self.block_offsets_t)
         out._transposed = not self._transposed
         out._size = torch.Size((self._size[1], self._size[0]))
+        out._packed = self._packed
         return out
 
     def contiguous(self):
@@ -259,10 +363,37 @@ class Matrix(torch.nn.Module):
     def offsets(self):
         return self._offsets
 
+    @property
+    def rowcol(self):
+        # Indices for the nonzero blocks packed as
+        # (row_index << 16) | column_index, built lazily and
+        # cached. Kernels that need both indices per block can
+        # load a single int32 instead of two int16s.
+        if 'rowcol' not in self._packed:
+            self._packed['rowcol'] = (
+                (self._row_indices.to(torch.int32) << 16) |
+                self._column_indices.to(torch.int32))
+        return self._packed['rowcol']
+
+    @property
+    def offsets_pairs(self):
+        # Packed row boundaries, built lazily and cached.
+        if 'offsets_pairs' not in self._packed:
+            self._packed['offsets_pairs'] = _pack_offsets(self._offsets)
+        return self._packed['offsets_pairs']
+
     @property
     def offsets_t(self):
         return self._offsets_t
 
+    @property
+    def offsets_t_pairs(self):
+        # Packed row boundaries of the transpose, built lazily and
+        # cached.
+        if 'offsets_t_pairs' not in self._packed:
+            self._packed['offsets_t_pairs'] = _pack_offsets(self._offsets_t)
+        return self._packed['offsets_t_pairs']
+
     @property
     def column_indices_t(self):
         return self._column_indices_t
@@ -297,18 +428,20 @@ class Matrix(torch.nn.Module):
             raise ValueError(
                 "Can't change view on compressed dimension. "
                 f"{self.size()[-1]} v. {shape[-1]}.")
-        if np.prod(shape) != np.prod(self.size()):
+        if math.prod(shape) != math.prod(self.size()):
             raise ValueError(
                 "Mismatch in numel of Matrix and new shape. "
-                f"{np.prod(self.size())} v. {np.prod(shape)}")
-        return Matrix(shape,
-                      self.data,
-                      self.row_indices,
-                      self.column_indices,
-                      self.offsets,
-                      self.column_indices_t,
-                      self.offsets_t,
-                      self.block_offsets_t)
+                f"{math.prod(self.size())} v. {math.prod(shape)}")
+        out = Matrix(shape,
+                     self.data,
+                     self.row_indices,
+                     self.column_indices,
+                     self.offsets,
+                     self.column_indices_t,
+                     self.offsets_t,
+                     self.block_offsets_t)
+        out._packed = self._packed
+        return out
 
     @property
     def grad(self):
@@ -326,4 +459,5 @@ class Matrix(torch.nn.Module):
                      self.column_indices_t,
                      self.offsets_t,
                      self.block_offsets_t)
+        out._packed = self._packed
         return out if self.is_contiguous() else out.t()
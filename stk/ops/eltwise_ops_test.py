@@ -52,7 +52,7 @@ class EltwiseOpsTest(parameterized.TestCase):
 
     def testEltwiseMul(self, m, n, sparsity, blocking, dtype):
 
-        a_dense, a = _dense_and_sparse(m, n, sparsity, blocking, dtype)
+        a_dense, a, _ = _dense_and_sparse(m, n, sparsity, blocking, dtype)
         b_dense, b = _dense_and_sparse_like(a)
 
         out = stk.ops.mul(a, b)
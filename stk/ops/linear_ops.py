@@ -7,6 +7,10 @@ from stk.matrix import Matrix
 def dsd(a, b):
     assert isinstance(a, Matrix)
     assert isinstance(b, torch.Tensor)
+
+    # Only build the packed row boundaries for the offsets the
+    # launch will actually read.
+    transpose_a = not a.is_contiguous()
     return sputnik.dsd(
         a.size(),
         a.data, a.offsets,
@@ -15,13 +19,19 @@ def dsd(a, b):
         a.offsets_t,
         a.column_indices_t,
         a.block_offsets_t,
-        not a.is_contiguous(),
-        b)
+        transpose_a,
+        b,
+        None if transpose_a else a.offsets_pairs,
+        a.offsets_t_pairs if transpose_a else None)
 
 
 def dds(a, b):
     assert isinstance(a, torch.Tensor)
     assert isinstance(b, Matrix)
+
+    # Only build the packed row boundaries for the offsets the
+    # launch will actually read.
+    transpose_b = not b.is_contiguous()
     return sputnik.dds(
         a,
         b.size(),
@@ -31,7 +41,9 @@ def dds(a, b):
         b.offsets_t,
         b.column_indices_t,
         b.block_offsets_t,
-        not b.is_contiguous())
+        transpose_b,
+        b.offsets_pairs if transpose_b else None,
+        None if transpose_b else b.offsets_t_pairs)
 
 
 def sdd(a, b, topo):
@@ -48,7 +60,8 @@ def sdd(a, b, topo):
         topo.column_indices,
         topo.offsets_t,
         topo.column_indices_t,
-        topo.block_offsets_t)
+        topo.block_offsets_t,
+        topo.rowcol)
     return Matrix(topo.size(),
                   out,
                   topo.row_indices,